@@ -0,0 +1,3 @@
+from typing import Any, List, Tuple
+
+def validate_and_sum(data: List[Any], start: float = ...) -> Tuple[int, float]: ...
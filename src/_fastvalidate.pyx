@@ -0,0 +1,53 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled validate-and-sum kernel for src/main.py.
+
+Mirrors the pure-Python checks in main._checked_value() and the bulk
+reduction in main._validate_and_sum(), with typed C locals and borrowed
+dict lookups. Build it in place with:
+
+    CFLAGS="-O3 -march=native" cythonize -i src/_fastvalidate.pyx
+
+main.py falls back to the pure-Python path when the extension is not built.
+"""
+
+from cpython.dict cimport PyDict_GetItemString
+from cpython.ref cimport PyObject
+
+
+cpdef tuple validate_and_sum(list data, double start=0.0):
+    """Validate every item of `data` and return (count, start + values)."""
+    cdef Py_ssize_t i
+    cdef Py_ssize_t count = len(data)
+    cdef double total = start
+    cdef PyObject *field
+    cdef object item, id_, name, value
+
+    for i in range(count):
+        item = data[i]
+        if type(item) is not dict:
+            raise ValueError("item must be an object")
+
+        field = PyDict_GetItemString(item, "id")
+        if field is NULL:
+            raise ValueError("missing field 'id'")
+        id_ = <object>field
+        if type(id_) is not int and type(id_) is not bool:
+            raise ValueError("field 'id' must be int")
+
+        field = PyDict_GetItemString(item, "name")
+        if field is NULL:
+            raise ValueError("missing field 'name'")
+        name = <object>field
+        if type(name) is not str or not name or name.isspace():
+            raise ValueError("field 'name' must be a non-empty string")
+
+        field = PyDict_GetItemString(item, "value")
+        if field is NULL:
+            raise ValueError("missing field 'value'")
+        value = <object>field
+        if type(value) is not float and type(value) is not int and type(value) is not bool:
+            raise ValueError("field 'value' must be a number")
+        total += <double>value
+
+    return count, total
@@ -0,0 +1,24 @@
+"""
+msgspec-based decoder for src/main.py, used when msgspec is installed.
+
+Parses and validates the whole input list in one pass in C. It lives
+outside main.py so that module stays compilable with mypyc, which cannot
+build msgspec.Struct subclasses.
+"""
+
+from typing import Annotated, List
+
+import msgspec
+
+
+class Item(msgspec.Struct):
+    """A valid input item. `name` must contain a non-whitespace character."""
+
+    id: int
+    name: Annotated[str, msgspec.Meta(pattern=r"\S")]
+    value: float
+
+
+decode_items = msgspec.json.Decoder(List[Item]).decode
+
+DecodeError = msgspec.DecodeError
@@ -4,6 +4,9 @@ CLI entrypoint for TASK_1074.
 
 Subcommand: process
   - Reads --input <file> (JSON list of objects)
+  - With --stream, parses the list incrementally (requires ijson) so
+    peak memory does not grow with the number of items
+  - With --ndjson, reads one JSON object per line instead of a list
   - Validates each object has fields:
       id (int), name (non-empty string), value (number)
   - Prints summary JSON to stdout:
@@ -12,46 +15,342 @@ Subcommand: process
 
 from __future__ import annotations
 import argparse
+import contextlib
+import importlib
+import io
+import itertools
 import json
+import mmap
+import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Iterable, Iterator, List, Tuple, TypedDict
 
+# JSON backend for parsing, in order of preference: orjson, then ujson, then
+# the stdlib json module. All three accept bytes in loads().
+for _json_name in ("orjson", "ujson", "json"):
+    try:
+        _json = importlib.import_module(_json_name)
+        break
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
 
-def validate_item(item: Dict[str, Any]) -> None:
-    """Validate a single item. Raises ValueError on invalid item."""
-    if not isinstance(item, dict):
+# Optional msgspec decoder that parses and validates a whole list at once.
+try:
+    from ._structdecode import DecodeError as _StructDecodeError
+    from ._structdecode import decode_items as _decode_items
+except ImportError:  # pragma: no cover - depends on environment
+    _decode_items = None  # type: ignore[assignment]
+
+# Optional compiled kernel, built from src/_fastvalidate.pyx with Cython.
+try:
+    from ._fastvalidate import validate_and_sum as _compiled_validate_and_sum
+except ImportError:  # pragma: no cover - depends on environment
+    _compiled_validate_and_sum = None  # type: ignore[assignment]
+
+
+class Summary(TypedDict):
+    """Shape of the summary returned by process_file()."""
+
+    count: int
+    total_value: float
+    avg_value: float
+
+
+def _loads(data: bytes) -> Any:
+    """Parse UTF-8 encoded JSON `data` with the selected backend."""
+    return _json.loads(data)
+
+
+@contextlib.contextmanager
+def _read_buffer(path: str) -> Iterator[Any]:
+    """Yield the contents of the file at `path` as a buffer.
+
+    Regular files are memory-mapped instead of copied into a bytes object.
+    Empty files cannot be mapped, and pipes report a size of 0 as well, so
+    both are read normally.
+    """
+    with open(path, "rb") as fh:
+        if not os.fstat(fh.fileno()).st_size:
+            yield fh.read()
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                yield view
+
+
+def _load_path(path: str) -> Any:
+    """Parse the JSON document stored in the file at `path`."""
+    # orjson parses straight from a buffer; the other backends need bytes.
+    if _json_name == "orjson":
+        with _read_buffer(path) as buf:
+            return _json.loads(buf)
+    with open(path, "rb") as fh:
+        return _loads(fh.read())
+
+
+def _load_path_exact(path: str) -> Any:
+    """Parse the file at `path` with the stdlib json module.
+
+    json.loads() keeps integers of any size exact and accepts NaN, Infinity
+    and out-of-range numbers such as 1e400, all of which orjson and msgspec
+    either reject or turn into floats.
+    """
+    with open(path, "rb") as fh:
+        return json.loads(fh.read())
+
+
+def _has_float_id(data: Any) -> bool:
+    """Whether the parsed list `data` holds an item with a float 'id'.
+
+    orjson decodes integers that do not fit in 64 bits as floats, so a
+    validation error can only be an orjson artifact if such an id exists.
+    """
+    return isinstance(data, list) and any(
+        type(item) is dict and type(item.get("id")) is float for item in data
+    )
+
+
+def _dumps(obj: Summary) -> bytes:
+    """Serialize the summary `obj` to compact UTF-8 encoded JSON.
+
+    The stdlib json module is used whichever backend is selected, so the
+    output never depends on it: orjson and ujson format floats differently
+    (2e16 rather than 2e+16) and write non-finite totals as null or not at
+    all. The summary is a single small dict, so nothing is lost.
+    """
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _write_stdout(data: bytes) -> None:
+    """Write encoded `data` to stdout, bypassing the text layer if possible."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # e.g. contextlib.redirect_stdout() to an io.StringIO
+        sys.stdout.write(data.decode("utf-8"))
+    else:
+        buffer.write(data)
+    sys.stdout.flush()
+
+
+_MISSING = object()
+
+# NDJSON input is decoded this many lines at a time. Each batch is a plain
+# list, so it goes through the same validate-and-sum kernel as a bulk-parsed
+# list, the compiled one included, while memory stays bounded by the batch.
+_NDJSON_BATCH = 65536
+
+
+def _checked_value(item: Any) -> float:
+    """Validate a single item and return its 'value' field.
+
+    Each field is read exactly once, so callers that need the value do not
+    have to look it up again after validation.
+    """
+    # JSON decoding only yields exact builtin types, so `type(x) is T` is
+    # enough here and cheaper than isinstance(). bool is accepted wherever
+    # int is, as isinstance() did.
+    if type(item) is not dict:
         raise ValueError("item must be an object")
-    if "id" not in item:
+    get = item.get
+    id_ = get("id", _MISSING)
+    if id_ is _MISSING:
         raise ValueError("missing field 'id'")
-    if not isinstance(item["id"], int):
+    t = type(id_)
+    if t is not int and t is not bool:
         raise ValueError("field 'id' must be int")
-    if "name" not in item:
+    name = get("name", _MISSING)
+    if name is _MISSING:
         raise ValueError("missing field 'name'")
-    if not isinstance(item["name"], str) or not item["name"].strip():
+    # isspace() tests the same characters strip() removes, without
+    # allocating a stripped copy of the name.
+    if type(name) is not str or not name or name.isspace():
         raise ValueError("field 'name' must be a non-empty string")
-    if "value" not in item:
+    value = get("value", _MISSING)
+    if value is _MISSING:
         raise ValueError("missing field 'value'")
-    if not isinstance(item["value"], (int, float)):
+    t = type(value)
+    if t is not float and t is not int and t is not bool:
         raise ValueError("field 'value' must be a number")
+    return value
 
 
-def process_file(path: str) -> Dict[str, float]:
-    """Read JSON list from `path`, validate items, and return summary."""
-    with open(path, "r", encoding="utf-8") as fh:
-        data = json.load(fh)
+def validate_item(item: Any) -> None:
+    """Validate a single item. Raises ValueError on invalid item."""
+    _checked_value(item)
 
-    if not isinstance(data, list):
+
+def _iter_stream(fh: io.BufferedReader) -> Iterator[Any]:
+    """Yield the items of the top-level JSON list in `fh` one by one."""
+    # Imported here rather than at module load, which it would slow down
+    # for every other mode.
+    try:
+        ijson = importlib.import_module("ijson")
+    except ImportError:
+        raise RuntimeError("--stream requires the 'ijson' package") from None
+    # Look at the first non-whitespace byte without consuming it, which
+    # works on pipes too, so ijson still reads the document from its start.
+    head = fh.peek(1)
+    while head and not head.lstrip():
+        fh.read(len(head))
+        head = fh.peek(1)
+    if head and not head.lstrip().startswith(b"["):
         raise ValueError("input JSON must be a list")
+    try:
+        yield from ijson.items(fh, "item", use_float=True)
+    except ijson.JSONError as exc:
+        # Raise a ValueError like the other parsers, keeping only the first
+        # line of yajl's message, which goes on to draw a multi-line caret.
+        message = str(exc).partition("\n")[0]
+        raise ValueError(f"invalid JSON: {message}") from None
+
+
+def _iter_lines(fh: BinaryIO) -> Iterator[bytes]:
+    """Yield the non-blank lines of `fh`."""
+    for line in fh:
+        if not line.isspace():
+            yield line
+
 
+def _summary(count: int, total: float) -> Summary:
+    """Build the summary dict from the item count and value total."""
+    avg = (total / count) if count else 0.0
+    return {"count": count, "total_value": total, "avg_value": avg}
+
+
+def _iter_values(items: Iterable[Any]) -> Iterator[float]:
+    """Validate each of `items` and yield its 'value' field."""
+    check = _checked_value
+    for item in items:
+        yield check(item)
+
+
+def _summarize(items: Iterable[Any]) -> Summary:
+    """Validate `items` and reduce them to the summary dict."""
     total = 0.0
     count = 0
-    for item in data:
-        validate_item(item)
-        total += float(item["value"])
+    for value in _iter_values(items):
+        total += value
         count += 1
+    return _summary(count, total)
 
-    avg = (total / count) if count else 0.0
-    return {"count": count, "total_value": total, "avg_value": avg}
+
+def _validate_and_sum(chunk: List[Any], start: float = 0.0) -> Tuple[int, float]:
+    """Validate a list of items and return their count and value total.
+
+    Values are added one by one, left to right, onto `start`. Every kernel
+    sums this way, so all modes give bit-identical totals and a total too
+    large for a float becomes inf rather than an error. Passing the running
+    total as `start` lets batches add up exactly as a single pass would.
+    """
+    if _compiled_validate_and_sum is not None:
+        return _compiled_validate_and_sum(chunk, start)
+
+    total = start
+    for value in _iter_values(chunk):
+        total += value
+    return len(chunk), total
+
+
+def _sum_ndjson_batch(lines: List[bytes], start: float) -> Tuple[int, float]:
+    """Decode, validate and sum one batch of NDJSON lines onto `start`."""
+    try:
+        items = [_loads(line) for line in lines]
+    except ValueError:
+        if _json_name != "orjson":
+            raise
+        # See _sum_list_at(): orjson rejects some input json.loads() accepts.
+        return _validate_and_sum([json.loads(line) for line in lines], start)
+    try:
+        return _validate_and_sum(items, start)
+    except ValueError:
+        if _json_name != "orjson" or not _has_float_id(items):
+            raise
+        return _validate_and_sum([json.loads(line) for line in lines], start)
+
+
+def _sum_ndjson(fh: BinaryIO) -> Tuple[int, float]:
+    """Validate and sum NDJSON items from `fh` in fixed-size batches."""
+    # The running total is passed on as `start`, so the batches add up
+    # exactly as one pass over every line would.
+    lines = _iter_lines(fh)
+    count = 0
+    total = 0.0
+    while True:
+        batch = list(itertools.islice(lines, _NDJSON_BATCH))
+        if not batch:
+            break
+        n, total = _sum_ndjson_batch(batch, total)
+        count += n
+    return count, total
+
+
+def _sum_list(data: Any) -> Tuple[int, float]:
+    """Validate and sum a parsed top-level JSON value, which must be a list."""
+    if not isinstance(data, list):
+        raise ValueError("input JSON must be a list")
+    return _validate_and_sum(data)
+
+
+def _sum_list_at(path: str) -> Tuple[int, float]:
+    """Parse the JSON list in the file at `path`, then validate and sum it."""
+    try:
+        data = _load_path(path)
+    except ValueError:
+        if _json_name != "orjson":
+            raise
+        # orjson rejects NaN, Infinity and 1e400, which json.load() accepts.
+        return _sum_list(_load_path_exact(path))
+    try:
+        return _sum_list(data)
+    except ValueError:
+        # orjson decodes integers that do not fit in 64 bits as floats, so
+        # an otherwise valid id such as 2**70 fails validation. Only then is
+        # the file re-parsed; any other invalid item is reported as is.
+        if _json_name != "orjson" or not _has_float_id(data):
+            raise
+        return _sum_list(_load_path_exact(path))
+
+
+def process_file(
+    path: str, stream: bool = False, ndjson: bool = False
+) -> Summary:
+    """Read JSON list from `path`, validate items, and return summary.
+
+    When `stream` is true the list is parsed item by item with ijson instead
+    of being loaded into memory in full; ijson's C backend limits integers
+    to 64 bits in that mode and rejects the NaN, Infinity and out-of-range
+    numbers such as 1e400 that the other modes accept. When `ndjson` is
+    true the file is read as newline-delimited JSON, one item per line,
+    holding only one batch of lines in memory at a time.
+    """
+    if ndjson:
+        with open(path, "rb") as fh:
+            count, total = _sum_ndjson(fh)
+        return _summary(count, total)
+
+    if stream:
+        with open(path, "rb") as fh:
+            return _summarize(_iter_stream(fh))
+
+    if _decode_items is not None:
+        try:
+            with _read_buffer(path) as buf:
+                items = _decode_items(buf)
+        except _StructDecodeError:
+            # msgspec is stricter than validate_item() (it rejects bools,
+            # for one) and words its errors differently. It already keeps
+            # big ints exact, so re-parse once with json.loads(), which
+            # accepts or reports the input exactly, rather than via orjson.
+            count, total = _sum_list(_load_path_exact(path))
+            return _summary(count, total)
+        # Same left-to-right sum as _validate_and_sum().
+        total = 0.0
+        for item in items:
+            total += item.value
+        return _summary(len(items), total)
+
+    count, total = _sum_list_at(path)
+    return _summary(count, total)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -60,18 +359,46 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="command", required=True)
     p = sub.add_parser("process", help="Process JSON input and output summary JSON")
     p.add_argument("--input", "-i", required=True, help="Path to input JSON file")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Parse the input incrementally instead of loading it whole "
+            "(needs ijson; integers are limited to 64 bits, and NaN, "
+            "Infinity and out-of-range numbers are rejected)"
+        ),
+    )
+    mode.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Treat the input as newline-delimited JSON, one object per line",
+    )
     return parser
 
 
+_PARSER: argparse.ArgumentParser | None = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Return the module-level parser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = build_parser()
+    return _PARSER
+
+
 def main(argv: List[str] | None = None) -> int:
     """CLI entrypoint. Returns exit code."""
-    parser = build_parser()
+    parser = _get_parser()
     args = parser.parse_args(argv)
 
     try:
         if args.command == "process":
-            summary = process_file(args.input)
-            print(json.dumps(summary, ensure_ascii=False))
+            summary = process_file(
+                args.input, stream=args.stream, ndjson=args.ndjson
+            )
+            _write_stdout(_dumps(summary) + b"\n")
             return 0
         else:
             parser.print_help()
@@ -0,0 +1,30 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+import pytest
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+    import json
+
+
+def _write_json(path, obj):
+    """Serialize `obj` to `path` as UTF-8 JSON."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj))
+    else:
+        path.write_text(json.dumps(obj), encoding="utf-8")
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    """Return a function that writes an object to tmp_path/in.json."""
+
+    def write(obj):
+        path = tmp_path / "in.json"
+        _write_json(path, obj)
+        return path
+
+    return write
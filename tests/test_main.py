@@ -2,15 +2,33 @@
 """
 Unit and integration tests for src/main.py process subcommand.
 """
+import contextlib
+import io
 import json
+import re
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
-
-from src.main import main, process_file, validate_item
+from conftest import _write_json
+
+from src.main import _dumps, _validate_and_sum, main, process_file, validate_item
+
+# The invalid-item cases from TestValidateItem, for checking other kernels.
+INVALID_ITEMS = [
+    {"name": "test", "value": 10.5},
+    {"id": 1, "value": 10.5},
+    {"id": 1, "name": "test"},
+    {"id": "1", "name": "test", "value": 10.5},
+    {"id": 1.5, "name": "test", "value": 10.5},
+    {"id": 1, "name": 123, "value": 10.5},
+    {"id": 1, "name": "", "value": 10.5},
+    {"id": 1, "name": "   ", "value": 10.5},
+    {"id": 1, "name": "test", "value": "10.5"},
+    "not a dict",
+    [1, 2, 3],
+]
 
 
 class TestValidateItem:
@@ -95,126 +113,326 @@ class TestValidateItem:
 class TestProcessFile:
     """Unit tests for process_file function."""
 
-    def test_valid_single_item(self):
+    def test_valid_single_item(self, write_json):
         """Test processing a single valid item."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump([{"id": 1, "name": "test", "value": 10.0}], f)
-            f.flush()
-            result = process_file(f.name)
+        p = write_json([{"id": 1, "name": "test", "value": 10.0}])
+        result = process_file(str(p))
 
         assert result == {"count": 1, "total_value": 10.0, "avg_value": 10.0}
-        Path(f.name).unlink()
 
-    def test_valid_multiple_items(self):
+    def test_valid_multiple_items(self, write_json):
         """Test processing multiple valid items."""
         data = [
             {"id": 1, "name": "first", "value": 10.0},
             {"id": 2, "name": "second", "value": 20.0},
             {"id": 3, "name": "third", "value": 30.0},
         ]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            result = process_file(f.name)
+        p = write_json(data)
+        result = process_file(str(p))
 
         assert result == {"count": 3, "total_value": 60.0, "avg_value": 20.0}
-        Path(f.name).unlink()
 
-    def test_empty_list(self):
+    def test_empty_list(self, write_json):
         """Test processing an empty list."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump([], f)
-            f.flush()
-            result = process_file(f.name)
+        p = write_json([])
+        result = process_file(str(p))
 
         assert result == {"count": 0, "total_value": 0.0, "avg_value": 0.0}
-        Path(f.name).unlink()
 
-    def test_not_a_list(self):
+    def test_not_a_list(self, write_json):
         """Test that non-list JSON raises ValueError."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump({"id": 1, "name": "test", "value": 10.0}, f)
-            f.flush()
-            with pytest.raises(ValueError, match="input JSON must be a list"):
-                process_file(f.name)
-        Path(f.name).unlink()
-
-    def test_invalid_item_in_list(self):
+        p = write_json({"id": 1, "name": "test", "value": 10.0})
+        with pytest.raises(ValueError, match="input JSON must be a list"):
+            process_file(str(p))
+
+    def test_invalid_item_in_list(self, write_json):
         """Test that invalid item in list raises ValueError."""
         data = [
             {"id": 1, "name": "valid", "value": 10.0},
             {"id": 2, "name": "missing value"},  # missing 'value'
         ]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            with pytest.raises(ValueError, match="missing field 'value'"):
-                process_file(f.name)
-        Path(f.name).unlink()
+        p = write_json(data)
+        with pytest.raises(ValueError, match="missing field 'value'"):
+            process_file(str(p))
+
+    def test_bool_fields_accepted(self, write_json):
+        """Test that bool 'id' and 'value' are accepted, as by validate_item."""
+        p = write_json([{"id": True, "name": "flag", "value": True}])
+        result = process_file(str(p))
+
+        assert result == {"count": 1, "total_value": 1.0, "avg_value": 1.0}
+
+    def test_float_id_in_list(self, write_json):
+        """Test that a float 'id' in the list raises ValueError."""
+        p = write_json([{"id": 1.0, "name": "test", "value": 10.0}])
+        with pytest.raises(ValueError, match="field 'id' must be int"):
+            process_file(str(p))
+
+    @pytest.mark.parametrize("use_msgspec", [True, False])
+    def test_id_beyond_64_bits(self, tmp_path, monkeypatch, use_msgspec):
+        """Test that ids too large for 64 bits are accepted, as by json.load."""
+        if not use_msgspec:
+            monkeypatch.setattr("src.main._decode_items", None)
+        p = tmp_path / "in.json"
+        p.write_text(f'[{{"id": {2**70}, "name": "big", "value": 1.5}}]')
+        result = process_file(str(p))
+
+        assert result == {"count": 1, "total_value": 1.5, "avg_value": 1.5}
+
+    @pytest.mark.parametrize("use_msgspec", [True, False])
+    def test_invalid_item_parsed_once(self, write_json, monkeypatch, use_msgspec):
+        """Test that an invalid item does not trigger the big-int re-parse."""
+        monkeypatch.setattr("src.main._json", pytest.importorskip("orjson"))
+        monkeypatch.setattr("src.main._json_name", "orjson")
+        if use_msgspec:
+            pytest.importorskip("msgspec")
+        else:
+            monkeypatch.setattr("src.main._decode_items", None)
+        calls = []
+        loads = json.loads
+        monkeypatch.setattr(json, "loads", lambda s: calls.append(s) or loads(s))
+        p = write_json([{"id": 1, "name": "missing value"}])
+        with pytest.raises(ValueError, match="missing field 'value'"):
+            process_file(str(p))
+
+        # msgspec's rejection is reported through one stdlib parse; orjson's
+        # own parse is enough when msgspec is not in use.
+        assert len(calls) == (1 if use_msgspec else 0)
 
     def test_file_not_found(self):
         """Test that missing file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
             process_file("/nonexistent/path/file.json")
 
-    def test_invalid_json(self):
-        """Test that invalid JSON raises JSONDecodeError."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            f.write("not valid json {")
-            f.flush()
-            with pytest.raises(json.JSONDecodeError):
-                process_file(f.name)
-        Path(f.name).unlink()
+    def test_invalid_json(self, tmp_path):
+        """Test that invalid JSON raises a ValueError (JSONDecodeError)."""
+        p = tmp_path / "in.json"
+        p.write_text("not valid json {")
+        with pytest.raises(ValueError):
+            process_file(str(p))
+
+    def test_python_reduction(self, monkeypatch):
+        """Test the pure-Python reduction: left to right, inf on overflow."""
+        monkeypatch.setattr("src.main._compiled_validate_and_sum", None)
+        tenths = [{"id": i, "name": "tenth", "value": 0.1} for i in range(10)]
+        huge = [{"id": i, "name": "huge", "value": 1e308} for i in range(2)]
+
+        assert _validate_and_sum(tenths) == (10, 0.9999999999999999)
+        assert _validate_and_sum(huge) == (2, float("inf"))
+        assert _validate_and_sum(tenths[:2], start=0.6) == (2, 0.6 + 0.1 + 0.1)
+
+    def test_stream_matches_bulk(self, write_json):
+        """Test that stream mode yields the same summary as a bulk parse."""
+        pytest.importorskip("ijson")
+        data = [
+            {"id": 1, "name": "first", "value": 1.5},
+            {"id": 2, "name": "second", "value": 2},
+        ]
+        p = write_json(data)
+        result = process_file(str(p), stream=True)
+
+        assert result == process_file(str(p))
+        assert result == {"count": 2, "total_value": 3.5, "avg_value": 1.75}
+
+    def test_stream_not_a_list(self, write_json):
+        """Test that stream mode rejects a non-list top-level value."""
+        pytest.importorskip("ijson")
+        p = write_json({"id": 1, "name": "test", "value": 10.0})
+        with pytest.raises(ValueError, match="input JSON must be a list"):
+            process_file(str(p), stream=True)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            '[{"id": 1, "name": "test"',
+            '[{"id": 1 "name": "test"}]',
+            "",
+            '[{"id": 1, "name": "test", "value": NaN}]',
+        ],
+    )
+    def test_stream_invalid_json(self, tmp_path, text):
+        """Test that stream mode reports malformed JSON as a one-line ValueError."""
+        pytest.importorskip("ijson")
+        p = tmp_path / "in.json"
+        p.write_text(text)
+        with pytest.raises(ValueError, match=r"^invalid JSON: [^\n]+$"):
+            process_file(str(p), stream=True)
+
+    def test_stream_leading_whitespace(self, tmp_path):
+        """Test that stream mode skips whitespace before the list."""
+        pytest.importorskip("ijson")
+        p = tmp_path / "in.json"
+        p.write_text(' \n\t[{"id": 1, "name": "test", "value": 2.5}]')
+        result = process_file(str(p), stream=True)
+
+        assert result == {"count": 1, "total_value": 2.5, "avg_value": 2.5}
+
+    def test_stream_without_ijson(self, write_json, monkeypatch):
+        """Test that stream mode reports a missing ijson install."""
+        monkeypatch.setitem(sys.modules, "ijson", None)
+        p = write_json([])
+        with pytest.raises(RuntimeError, match="ijson"):
+            process_file(str(p), stream=True)
+
+    def test_ndjson(self, tmp_path):
+        """Test processing newline-delimited JSON, skipping blank lines."""
+        p = tmp_path / "in.ndjson"
+        p.write_text(
+            '{"id": 1, "name": "first", "value": 1.5}\n'
+            "\n"
+            '{"id": 2, "name": "second", "value": 2}\n'
+        )
+        result = process_file(str(p), ndjson=True)
+
+        assert result == {"count": 2, "total_value": 3.5, "avg_value": 1.75}
+
+    def test_ndjson_batches(self, tmp_path, monkeypatch):
+        """Test that NDJSON totals are combined across batches."""
+        monkeypatch.setattr("src.main._NDJSON_BATCH", 2)
+        p = tmp_path / "in.ndjson"
+        p.write_text(
+            "".join(
+                f'{{"id": {i}, "name": "item{i}", "value": {i}}}\n' for i in range(5)
+            )
+        )
+        result = process_file(str(p), ndjson=True)
+
+        assert result == {"count": 5, "total_value": 10.0, "avg_value": 2.0}
+
+    def test_ndjson_batches_sum_as_one_pass(self, tmp_path, monkeypatch):
+        """Test that batching does not change how NDJSON values are summed."""
+        monkeypatch.setattr("src.main._NDJSON_BATCH", 3)
+        p = tmp_path / "in.ndjson"
+        p.write_text('{"id": 1, "name": "tenth", "value": 0.1}\n' * 10)
+        result = process_file(str(p), ndjson=True)
+
+        assert result["total_value"] == 0.9999999999999999
+
+    def test_ndjson_id_beyond_64_bits(self, tmp_path):
+        """Test that NDJSON ids too large for 64 bits are accepted."""
+        p = tmp_path / "in.ndjson"
+        p.write_text(f'{{"id": {2**70}, "name": "big", "value": 2}}\n')
+        result = process_file(str(p), ndjson=True)
+
+        assert result == {"count": 1, "total_value": 2.0, "avg_value": 2.0}
+
+    def test_ndjson_invalid_item(self, tmp_path):
+        """Test that an invalid line in NDJSON input raises ValueError."""
+        p = tmp_path / "in.ndjson"
+        p.write_text('{"id": 1, "name": "valid", "value": 1}\n[1, 2]\n')
+        with pytest.raises(ValueError, match="item must be an object"):
+            process_file(str(p), ndjson=True)
+
+
+class TestCompiledKernel:
+    """Parity tests for the optional Cython kernel in src/_fastvalidate.pyx."""
+
+    @pytest.mark.parametrize("item", INVALID_ITEMS)
+    def test_invalid_item_matches_python(self, item):
+        """Test that the kernel rejects items exactly as validate_item does."""
+        fastvalidate = pytest.importorskip("src._fastvalidate")
+        with pytest.raises(ValueError) as expected:
+            validate_item(item)
+        valid = {"id": 0, "name": "ok", "value": 1.0}
+        with pytest.raises(ValueError, match=re.escape(str(expected.value))):
+            fastvalidate.validate_and_sum([valid, item])
+
+    def test_sum_matches_python(self, monkeypatch):
+        """Test that the kernel accepts and sums items as the Python path does."""
+        fastvalidate = pytest.importorskip("src._fastvalidate")
+        monkeypatch.setattr("src.main._compiled_validate_and_sum", None)
+        items = [{"id": i, "name": "tenth", "value": 0.1} for i in range(10)]
+        items += [
+            {"id": True, "name": " padded ", "value": True},
+            {"id": 2**70, "name": "int", "value": 3},
+            {"id": 3, "name": "extra", "value": 1.5, "other": None},
+        ]
+        huge = [{"id": i, "name": "huge", "value": 1e308} for i in range(2)]
+
+        assert fastvalidate.validate_and_sum(items) == _validate_and_sum(items)
+        assert fastvalidate.validate_and_sum(items, 0.5) == _validate_and_sum(
+            items, 0.5
+        )
+        assert fastvalidate.validate_and_sum(huge) == (2, float("inf"))
+
+
+def _process_as(mode, items, tmp_path, monkeypatch):
+    """Run process_file() over `items` in the given input mode."""
+    if mode == "stream":
+        pytest.importorskip("ijson")
+    if mode == "bulk-msgspec":
+        pytest.importorskip("msgspec")
+    if mode == "bulk-fallback":
+        monkeypatch.setattr("src.main._decode_items", None)
+    p = tmp_path / "in.json"
+    if mode == "ndjson":
+        p.write_text("".join(json.dumps(item) + "\n" for item in items))
+    else:
+        _write_json(p, items)
+    return process_file(
+        str(p), stream=mode == "stream", ndjson=mode == "ndjson"
+    )
+
+
+class TestModeParity:
+    """Tests that every input mode sums values the same way."""
+
+    MODES = ["bulk-msgspec", "bulk-fallback", "stream", "ndjson"]
+
+    @pytest.mark.parametrize("mode", MODES)
+    def test_inexact_values(self, mode, tmp_path, monkeypatch):
+        """Test that ten 0.1 values give the same left-to-right total."""
+        items = [{"id": i, "name": "tenth", "value": 0.1} for i in range(10)]
+        result = _process_as(mode, items, tmp_path, monkeypatch)
+
+        assert result["count"] == 10
+        assert result["total_value"] == 0.9999999999999999
+
+    @pytest.mark.parametrize("mode", MODES)
+    def test_overflow_to_infinity(self, mode, tmp_path, monkeypatch):
+        """Test that a total beyond the float range is inf, not an error."""
+        items = [{"id": i, "name": "huge", "value": 1e308} for i in range(2)]
+        result = _process_as(mode, items, tmp_path, monkeypatch)
+
+        assert result["count"] == 2
+        assert result["total_value"] == float("inf")
+
+    def test_main_prints_infinity(self, write_json, capsys):
+        """Test that main() prints an overflowing total and exits 0."""
+        p = write_json([{"id": i, "name": "huge", "value": 1e308} for i in range(2)])
+        exit_code = main(["process", "--input", str(p)])
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert '"total_value":Infinity' in captured.out
 
 
 class TestMainFunction:
     """Unit tests for main() CLI function."""
 
-    def test_main_valid_input(self, capsys):
+    def test_main_valid_input(self, write_json, capsys):
         """Test main() with valid input returns 0 and prints summary."""
         data = [
             {"id": 1, "name": "a", "value": 5.0},
             {"id": 2, "name": "b", "value": 15.0},
         ]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            exit_code = main(["process", "--input", f.name])
+        p = write_json(data)
+        exit_code = main(["process", "--input", str(p)])
 
         captured = capsys.readouterr()
         output = json.loads(captured.out)
         assert exit_code == 0
         assert output == {"count": 2, "total_value": 20.0, "avg_value": 10.0}
-        Path(f.name).unlink()
 
-    def test_main_invalid_input_returns_1(self, capsys):
+    def test_main_invalid_input_returns_1(self, write_json, capsys):
         """Test main() with invalid input returns 1."""
         data = [{"id": "not int", "name": "test", "value": 10.0}]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            exit_code = main(["process", "--input", f.name])
+        p = write_json(data)
+        exit_code = main(["process", "--input", str(p)])
 
         captured = capsys.readouterr()
         assert exit_code == 1
         assert "Error:" in captured.err
-        Path(f.name).unlink()
 
     def test_main_missing_file_returns_1(self, capsys):
         """Test main() with missing file returns 1."""
@@ -223,93 +441,136 @@ class TestMainFunction:
         assert exit_code == 1
         assert "Error:" in captured.err
 
-    def test_main_short_option(self, capsys):
+    def test_main_short_option(self, write_json, capsys):
         """Test main() with short -i option."""
         data = [{"id": 1, "name": "test", "value": 100.0}]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            exit_code = main(["process", "-i", f.name])
+        p = write_json(data)
+        exit_code = main(["process", "-i", str(p)])
 
         captured = capsys.readouterr()
         output = json.loads(captured.out)
         assert exit_code == 0
         assert output == {"count": 1, "total_value": 100.0, "avg_value": 100.0}
-        Path(f.name).unlink()
+
+    def test_main_ndjson_option(self, tmp_path, capsys):
+        """Test main() with the --ndjson option."""
+        p = tmp_path / "in.ndjson"
+        p.write_text('{"id": 1, "name": "a", "value": 4}\n')
+        exit_code = main(["process", "--ndjson", "-i", str(p)])
+
+        captured = capsys.readouterr()
+        output = json.loads(captured.out)
+        assert exit_code == 0
+        assert output == {"count": 1, "total_value": 4.0, "avg_value": 4.0}
+
+    def test_main_redirected_to_stringio(self, write_json):
+        """Test main() when stdout has no binary buffer."""
+        p = write_json([{"id": 1, "name": "a", "value": 2.5}])
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            exit_code = main(["process", "-i", str(p)])
+
+        assert exit_code == 0
+        assert out.getvalue() == '{"count":1,"total_value":2.5,"avg_value":2.5}\n'
+
+
+@pytest.fixture(params=["orjson", "ujson", "json"])
+def json_backend(request, monkeypatch):
+    """Select each available JSON backend in src.main in turn."""
+    module = pytest.importorskip(request.param)
+    monkeypatch.setattr("src.main._json", module)
+    monkeypatch.setattr("src.main._json_name", request.param)
+    return request.param
+
+
+class TestJSONBackends:
+    """Tests that every JSON backend parses and prints the same way."""
+
+    @pytest.mark.parametrize(
+        "values, expected",
+        [
+            ([1, 2.0], '{"count":2,"total_value":3.0,"avg_value":1.5}'),
+            ([1e16, 1e16], '{"count":2,"total_value":2e+16,"avg_value":1e+16}'),
+            ([1e-7], '{"count":1,"total_value":1e-07,"avg_value":1e-07}'),
+        ],
+    )
+    def test_output_format(
+        self, json_backend, write_json, monkeypatch, capsys, values, expected
+    ):
+        """Test that the summary is printed identically by every backend."""
+        monkeypatch.setattr("src.main._decode_items", None)
+        data = [{"id": i, "name": "item", "value": v} for i, v in enumerate(values)]
+        p = write_json(data)
+        exit_code = main(["process", "--input", str(p)])
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert captured.out == expected + "\n"
+
+    def test_non_finite_output(self, json_backend):
+        """Test that an infinite total is written as Infinity, not null."""
+        summary = {"count": 2, "total_value": float("inf"), "avg_value": float("inf")}
+        assert _dumps(summary) == (
+            b'{"count":2,"total_value":Infinity,"avg_value":Infinity}'
+        )
+
+    def test_invalid_json(self, json_backend, tmp_path, monkeypatch):
+        """Test that every backend reports malformed input as ValueError."""
+        monkeypatch.setattr("src.main._decode_items", None)
+        p = tmp_path / "in.json"
+        p.write_text("not valid json {")
+        with pytest.raises(ValueError):
+            process_file(str(p))
 
 
 class TestCLIIntegration:
-    """Integration tests that call the CLI as a subprocess."""
+    """Integration tests for the CLI.
+
+    Only the smoke test spawns a subprocess; the rest call main() in-process
+    to avoid paying interpreter start-up per test.
+    """
 
-    def test_cli_valid_input(self):
-        """Integration test: CLI processes valid input correctly."""
+    def test_cli_valid_input(self, write_json):
+        """Smoke test: `python -m src.main` processes valid input correctly."""
         data = [
             {"id": 1, "name": "item1", "value": 25.0},
             {"id": 2, "name": "item2", "value": 75.0},
         ]
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            result = subprocess.run(
-                [sys.executable, "-m", "src.main", "process", "--input", f.name],
-                capture_output=True,
-                text=True,
-                cwd=Path(__file__).parent.parent,
-            )
+        p = write_json(data)
+        result = subprocess.run(
+            [sys.executable, "-m", "src.main", "process", "--input", str(p)],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent.parent,
+        )
 
         assert result.returncode == 0
         output = json.loads(result.stdout)
         assert output == {"count": 2, "total_value": 100.0, "avg_value": 50.0}
-        Path(f.name).unlink()
 
-    def test_cli_invalid_input_exits_1(self):
+    def test_cli_invalid_input_exits_1(self, write_json, capsys):
         """Integration test: CLI exits with code 1 on invalid input."""
         data = [{"id": 1, "name": "test"}]  # missing 'value'
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump(data, f)
-            f.flush()
-            result = subprocess.run(
-                [sys.executable, "-m", "src.main", "process", "--input", f.name],
-                capture_output=True,
-                text=True,
-                cwd=Path(__file__).parent.parent,
-            )
+        p = write_json(data)
+        exit_code = main(["process", "--input", str(p)])
 
-        assert result.returncode == 1
-        assert "Error:" in result.stderr
-        Path(f.name).unlink()
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "Error:" in captured.err
 
-    def test_cli_missing_input_argument(self):
+    def test_cli_missing_input_argument(self, capsys):
         """Integration test: CLI errors when --input is missing."""
-        result = subprocess.run(
-            [sys.executable, "-m", "src.main", "process"],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent,
-        )
-        assert result.returncode != 0
+        with pytest.raises(SystemExit) as excinfo:
+            main(["process"])
+        assert excinfo.value.code != 0
+        assert "--input" in capsys.readouterr().err
 
-    def test_cli_empty_list(self):
+    def test_cli_empty_list(self, write_json, capsys):
         """Integration test: CLI handles empty list correctly."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as f:
-            json.dump([], f)
-            f.flush()
-            result = subprocess.run(
-                [sys.executable, "-m", "src.main", "process", "--input", f.name],
-                capture_output=True,
-                text=True,
-                cwd=Path(__file__).parent.parent,
-            )
+        p = write_json([])
+        exit_code = main(["process", "--input", str(p)])
 
-        assert result.returncode == 0
-        output = json.loads(result.stdout)
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        output = json.loads(captured.out)
         assert output == {"count": 0, "total_value": 0.0, "avg_value": 0.0}
-        Path(f.name).unlink()